@@ -1,57 +1,81 @@
 import streamlit as st
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 import matplotlib.ticker as mticker
 import numpy as np
 
-def calculate_compound_interest(principal, annual_rate_percent, years, monthly_payment=0, compounds_per_year=12):
-    if annual_rate_percent < 0 or principal < 0 or years < 0 or monthly_payment < 0:
-        return None, None
+@st.cache_data(max_entries=128)
+def calculate_compound_interest(principals, annual_rates_percent, years, monthly_payments, compounds_per_year=12):
+    principals = np.asarray(principals, dtype=float)
+    annual_rates_percent = np.asarray(annual_rates_percent, dtype=float)
+    years = np.asarray(years, dtype=int)
+    monthly_payments = np.asarray(monthly_payments, dtype=float)
 
     if compounds_per_year <= 0:
         return None, None
 
-    if annual_rate_percent == 0:
-        rate_per_period = 0
-    else:
-        rate_per_period = (annual_rate_percent / 100.0) / compounds_per_year
-
-    yearly_balances = [principal]
-    current_balance = principal
-    total_periods = years * compounds_per_year
-
-    periods_calculated = 0
-    for year in range(1, years + 1):
-        for _ in range(compounds_per_year):
-            periods_calculated += 1
-            interest = current_balance * rate_per_period
-            current_balance += interest
-            current_balance += monthly_payment
-            if periods_calculated >= total_periods:
-                break
-        yearly_balances.append(current_balance)
-        if periods_calculated >= total_periods:
-            break
-
-    year_list = list(range(len(yearly_balances)))
+    valid = (annual_rates_percent >= 0) & (principals >= 0) & (years >= 0) & (monthly_payments >= 0)
+
+    rates_per_period = (annual_rates_percent[:, None] / 100.0) / compounds_per_year
+
+    total_periods = max(years.max(), 0) * compounds_per_year
+
+    # Closed form of B_{n+1} = B_n * (1 + r) + PMT, evaluated for every scenario and period at once
+    n = np.arange(total_periods + 1)
+    growth = (1 + rates_per_period) ** n
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annuity = np.where(rates_per_period > 0, (growth - 1) / rates_per_period, n)
+    balances = principals[:, None] * growth + monthly_payments[:, None] * annuity
+    yearly_balances = balances[:, ::compounds_per_year]
+
+    # Blank out invalid scenarios and years past each horizon so matplotlib skips them
+    year_list = list(range(yearly_balances.shape[1]))
+    yearly_balances[np.arange(len(year_list)) > years[:, None]] = np.nan
+    yearly_balances[~valid] = np.nan
     return year_list, yearly_balances
 
+@st.cache_data(max_entries=32)
+def build_plot(scenarios_tuple):
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    for years, balances, label in scenarios_tuple:
+        ax.plot(years, balances, marker='o', linestyle='-', markersize=4, label=label)
+
+    ax.set_title('Compound Interest Growth Comparison')
+    ax.set_xlabel('Years')
+    ax.set_ylabel('Account Balance ($)')
+
+    # Fixed formatter
+    formatter = mticker.StrMethodFormatter("${x:,.0f}")
+    ax.yaxis.set_major_formatter(formatter)
+
+    ax.legend(title="Scenarios")
+    ax.grid(True, linestyle='--', alpha=0.6)
+    fig.tight_layout()
+
+    return fig
+
 # --- Streamlit UI ---
 st.title("Compound Interest Calculator")
 
 num_scenarios = st.number_input("How many scenarios do you want to compare?", min_value=1, max_value=5, value=1, step=1)
 
-scenarios = []
+principals, rates, years_list, monthly_payments = [], [], [], []
 
 for i in range(num_scenarios):
     st.subheader(f"Scenario {i + 1}")
-    principal = st.number_input(f"Principal Amount for Scenario {i + 1}", min_value=0.0, value=1000.0, step=100.0)
-    rate = st.number_input(f"Annual Interest Rate (%) for Scenario {i + 1}", min_value=0.0, value=5.0, step=0.1)
-    years = st.number_input(f"Number of Years for Scenario {i + 1}", min_value=1, value=10, step=1)
-    monthly_payment = st.number_input(f"Monthly Payment Amount for Scenario {i + 1}", min_value=0.0, value=0.0, step=10.0)
+    principals.append(st.number_input(f"Principal Amount for Scenario {i + 1}", min_value=0.0, value=1000.0, step=100.0))
+    rates.append(st.number_input(f"Annual Interest Rate (%) for Scenario {i + 1}", min_value=0.0, value=5.0, step=0.1))
+    years_list.append(st.number_input(f"Number of Years for Scenario {i + 1}", min_value=1, value=10, step=1))
+    monthly_payments.append(st.number_input(f"Monthly Payment Amount for Scenario {i + 1}", min_value=0.0, value=0.0, step=10.0))
 
-    year_list, balance_list = calculate_compound_interest(principal, rate, years, monthly_payment)
+year_list, balance_matrix = calculate_compound_interest(tuple(principals), tuple(rates), tuple(years_list), tuple(monthly_payments))
+
+scenarios = []
 
-    if year_list is not None:
+if year_list is not None:
+    for principal, rate, years, monthly_payment, balance_list in zip(principals, rates, years_list, monthly_payments, balance_matrix):
+        if np.isnan(balance_list[0]):
+            continue
         label = f"P=${principal:,.0f}, r={rate}%, Yrs={years}"
         if monthly_payment > 0:
             label += f", PMT=${monthly_payment:,.0f}/mo"
@@ -59,27 +83,15 @@ for i in range(num_scenarios):
             "years": year_list,
             "balances": balance_list,
             "label": label,
-            "final_balance": balance_list[-1]
+            "final_balance": balance_list[years]
         })
 
 # --- Plotting ---
 if scenarios:
     scenarios.sort(key=lambda x: x['final_balance'], reverse=True)
 
-    fig, ax = plt.subplots(figsize=(10, 6))
-    for scenario in scenarios:
-        ax.plot(scenario["years"], scenario["balances"], marker='o', linestyle='-', markersize=4, label=scenario["label"])
-
-    ax.set_title('Compound Interest Growth Comparison')
-    ax.set_xlabel('Years')
-    ax.set_ylabel('Account Balance ($)')
-
-    # Fixed formatter
-    formatter = mticker.FuncFormatter(lambda x, _: f"${x:,.0f}")
-    ax.yaxis.set_major_formatter(formatter)
-
-    ax.legend(title="Scenarios")
-    ax.grid(True, linestyle='--', alpha=0.6)
-    plt.tight_layout()
-
-    st.pyplot(fig)
\ No newline at end of file
+    scenarios_tuple = tuple(
+        (tuple(scenario["years"]), tuple(scenario["balances"].tolist()), scenario["label"])
+        for scenario in scenarios
+    )
+    st.pyplot(build_plot(scenarios_tuple))